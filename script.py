@@ -1,10 +1,25 @@
+import numpy as np
 import pandas as pd
 import requests
-from io import StringIO
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import weo
+from weo.dates import get_date, get_season, make_url_countries
 from datetime import datetime
 import json
 import os
+import functools
+import random
+import re
+import shutil
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,6 +27,25 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 current_year = datetime.now().year
 current_month = datetime.now().month
 
+# Print a progress line per variable and per country (errors are always printed)
+VERBOSE = os.environ.get('VERBOSE') == '1'
+
+# HTTP session that retries transient failures with exponential backoff
+retry_policy = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['GET', 'HEAD'],
+    respect_retry_after_header=True,
+)
+session = requests.Session()
+session.mount('https://', HTTPAdapter(max_retries=retry_policy))
+session.mount('http://', HTTPAdapter(max_retries=retry_policy))
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+# Attempts per WEO release before falling through to the next one
+WEO_DOWNLOAD_RETRIES = 3
+
 # Try multiple WEO releases in order of preference
 download_attempts = [
     (2025, 2),  # October 2025
@@ -24,17 +58,92 @@ download_attempts = [
 weo_downloaded = False
 weo_filepath = os.path.join(SCRIPT_DIR, 'weo.csv')
 
-for weo_year, weo_release in download_attempts:
+def download_weo_release(weo_year, weo_release):
+    """Download one WEO release, retrying transient failures with jittered backoff"""
+    for attempt in range(1, WEO_DOWNLOAD_RETRIES + 1):
+        try:
+            weo.download(year=weo_year, release=weo_release, filename=weo_filepath)
+            return
+        except ValueError:
+            # Invalid or not yet published release - retrying won't help
+            raise
+        except Exception as e:
+            # weo.download skips existing files, so drop the partial download
+            if os.path.exists(weo_filepath):
+                os.remove(weo_filepath)
+            if attempt == WEO_DOWNLOAD_RETRIES:
+                raise
+            print(f"  ✗ Attempt {attempt}/{WEO_DOWNLOAD_RETRIES} failed: {e}")
+            time.sleep(random.uniform(0, 2 ** attempt))
+
+def weo_cache_path(weo_year, weo_release):
+    """Parquet cache of the numeric WEO frame for one release"""
+    return os.path.join(SCRIPT_DIR, f'weo_{weo_year}_{weo_release}.parquet')
+
+def weo_file_version(filepath):
+    """Read the (year, release) a WEO file holds from its footer line, or None if there is none"""
+    with open(filepath, 'rb') as f:
+        f.seek(max(os.path.getsize(filepath) - 1024, 0))
+        # Dropping NUL bytes turns UTF-16 LE text into ASCII whatever the byte alignment
+        tail = f.read().replace(b'\x00', b'').decode('latin-1')
+    match = re.search(r'World Economic Outlook Database, (\w+) (\d{4})', tail)
+    if match is None:
+        return None
+    try:
+        return int(match[2]), get_season(match[1])
+    except ValueError:
+        return None
+
+def find_weo_cache(file_version):
+    """Return the cache for the release weo.csv holds, unless it is missing or older than weo.csv"""
+    if file_version is None:
+        return None
+    cache_path = weo_cache_path(*file_version)
+    if not os.path.exists(cache_path):
+        return None
+    # A weo.csv written after the cache means a fresh download; rebuild
+    if os.path.getmtime(weo_filepath) > os.path.getmtime(cache_path):
+        return None
+    return cache_path
+
+def probe_weo_releases():
+    """HEAD every candidate release concurrently; return the ones that look downloadable, in priority order"""
+    def is_available(weo_year, weo_release):
+        url = make_url_countries(get_date(weo_year, weo_release))
+        response = session.head(url, timeout=HTTP_TIMEOUT, allow_redirects=True)
+        return response.ok and 'text/html' not in response.headers.get('Content-Type', '')
+    
+    available = set()
+    with ThreadPoolExecutor(max_workers=len(download_attempts)) as executor:
+        futures = {executor.submit(is_available, *attempt): attempt for attempt in download_attempts}
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    available.add(futures[future])
+            except Exception:
+                # Unpublished release or network error - treat as unavailable
+                pass
+    return [attempt for attempt in download_attempts if attempt in available]
+
+# weo.download reuses an existing weo.csv, so only probe when a real download is needed.
+# If the probe finds nothing, fall back to trying every release in order.
+releases_to_try = download_attempts
+if not os.path.exists(weo_filepath):
+    releases_to_try = probe_weo_releases() or download_attempts
+
+for weo_year, weo_release in releases_to_try:
     try:
         print(f"Attempting to download WEO data: {weo_year} Release {weo_release}")
-        weo.download(year=weo_year, release=weo_release, filename=weo_filepath)
+        download_weo_release(weo_year, weo_release)
         
-        # Verify it's actually a CSV by checking first line
-        with open(weo_filepath, 'r', encoding='utf-8') as f:
-            first_line = f.readline()
-            if '<html>' in first_line.lower() or '<head>' in first_line.lower():
-                print(f"  ✗ Downloaded file is HTML, not CSV (redirect or error page)")
-                continue
+        # Verify it's actually a CSV by checking the first bytes (bounded, no decoding)
+        with open(weo_filepath, 'rb') as f:
+            head = f.read(256).lower()
+        if b'<html' in head or b'<head' in head:
+            print(f"  ✗ Downloaded file is HTML, not CSV (redirect or error page)")
+            # weo.download skips existing files, so clear it for the next release
+            os.remove(weo_filepath)
+            continue
         
         print(f"  ✓ Successfully downloaded {weo_year} Release {weo_release}")
         weo_downloaded = True
@@ -46,17 +155,55 @@ for weo_year, weo_release in download_attempts:
 if not weo_downloaded:
     raise RuntimeError("Could not download WEO data from any available release. Please download manually from https://www.imf.org/en/Publications/WEO/weo-database")
 
+# weo.download reuses an existing weo.csv, so key the cache on the release the file actually holds
+weo_version = weo_file_version(weo_filepath)
+weo_cache_file = find_weo_cache(weo_version)
+if weo_cache_file is not None:
+    print(f"✓ Found cached WEO data: {weo_cache_file}")
+
 # Get current year
 current_year = datetime.now().year
 
 # Get EMB holdings data
 url = 'https://www.ishares.com/us/products/239572/ishares-jp-morgan-usd-emerging-markets-bond-etf/1467271812596.ajax?fileType=csv&fileName=EMB_holdings&dataType=fund'
-response = requests.get(url)
-csv_data = StringIO(response.text)
-df = pd.read_csv(csv_data, skiprows=9)
+holdings_filepath = os.path.join(SCRIPT_DIR, 'emb_holdings.csv')
+holdings_validators_filepath = os.path.join(SCRIPT_DIR, 'emb_holdings.validators.json')
+
+# Conditional GET: send the validators from the last download so an unchanged file comes back as 304
+request_headers = {}
+if os.path.exists(holdings_filepath) and os.path.exists(holdings_validators_filepath):
+    with open(holdings_validators_filepath, 'r', encoding='utf-8') as f:
+        validators = json.load(f)
+    if validators.get('etag'):
+        request_headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        request_headers['If-Modified-Since'] = validators['last_modified']
+
+response = session.get(url, headers=request_headers, stream=True, timeout=HTTP_TIMEOUT)
+if response.status_code == 304:
+    print("✓ EMB holdings unchanged since last run, using cached copy")
+else:
+    response.raise_for_status()
+    # Stream the raw bytes to disk (no str decode), replacing the cache only once complete
+    response.raw.decode_content = True
+    try:
+        with open(holdings_filepath + '.tmp', 'wb') as f:
+            shutil.copyfileobj(response.raw, f)
+        os.replace(holdings_filepath + '.tmp', holdings_filepath)
+    finally:
+        # Only left behind if the stream failed partway
+        if os.path.exists(holdings_filepath + '.tmp'):
+            os.remove(holdings_filepath + '.tmp')
+    with open(holdings_validators_filepath, 'w', encoding='utf-8') as f:
+        json.dump({
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }, f)
+
+df = pd.read_csv(holdings_filepath, skiprows=9)
 
 # Extract countries
-countries = df['Location'].dropna().unique()
+countries = set(df['Location'].dropna().unique())
 
 # Country mapping to ISO codes
 country_mapping = {
@@ -73,68 +220,112 @@ country_mapping = {
     'Uruguay': 'URY'
 }
 
-# Filter countries that exist in mapping
-embi_countries = [country_mapping.get(country, country) for country in countries if country in country_mapping]
+# Filter countries that exist in mapping (sorted so the run is deterministic)
+embi_countries = sorted(country_mapping[country] for country in country_mapping.keys() & countries)
 
-# Try to initialize WEO data - with error handling for column issues
-print("\nAttempting to load WEO data...")
-try:
-    w = weo.WEO(weo_filepath)
-    print("✓ WEO data loaded successfully using weo library")
-except KeyError as e:
-    print(f"⚠ WEO library encountered column issue: {e}")
-    print("Inspecting CSV structure...")
-    
-    # Read the CSV directly to inspect
-    df_inspect = pd.read_csv(weo_filepath, nrows=5, sep='\t')
-    print(f"Available columns: {df_inspect.columns.tolist()}")
+# WEO-like accessor over a numeric frame indexed by (country, WEO Subject Code) with one column per year
+class CustomWEO:
+    def __init__(self, numeric):
+        self._numeric = numeric
+        # Yearly periods, matching the index weo.WEO.getc returns
+        self._periods = pd.PeriodIndex(numeric.columns.astype(str), freq='Y')
     
-    # Try alternative approach - read the full CSV
-    print("\nAttempting to read WEO CSV directly...")
-    df_weo = pd.read_csv(weo_filepath, sep='\t')
+    @classmethod
+    def from_csv_frame(cls, df):
+        """Build from a raw WEO frame whose year columns were parsed as floats"""
+        # Try to identify the country code column
+        country_col = None
+        for col in ['ISO', 'WEO Country Code', 'Country Code', 'ISO3']:
+            if col in df.columns:
+                country_col = col
+                break
+        
+        if not country_col:
+            raise ValueError(f"Could not identify country code column. Available columns: {df.columns.tolist()}")
+        
+        print(f"Using '{country_col}' as country identifier")
+        
+        # Index the year columns once by country and variable
+        year_cols = [col for col in df.columns if str(col).isdigit()]
+        return cls(df.set_index([country_col, 'WEO Subject Code'])[year_cols])
     
-    # Look for country-related columns
-    country_cols = [col for col in df_weo.columns if 'country' in col.lower() or 'iso' in col.lower()]
-    print(f"Found potential country columns: {country_cols}")
+    @functools.lru_cache(maxsize=None)
+    def getc(self, variable_code):
+        """Get variable data by country"""
+        if variable_code not in self._numeric.index.get_level_values('WEO Subject Code'):
+            raise ValueError(f"Variable {variable_code} not found")
+        
+        # Slice the precomputed numeric frame; transpose so years are rows
+        result = self._numeric.xs(variable_code, level='WEO Subject Code').T
+        result.index = self._periods
+        return result
     
-    # Create a custom WEO-like wrapper
-    class CustomWEO:
-        def __init__(self, df):
-            self.df = df
-            # Try to identify the country code column
-            self.country_col = None
-            for col in ['ISO', 'WEO Country Code', 'Country Code', 'ISO3']:
-                if col in df.columns:
-                    self.country_col = col
-                    break
-            
-            if not self.country_col:
-                raise ValueError(f"Could not identify country code column. Available columns: {df.columns.tolist()}")
-            
-            print(f"Using '{self.country_col}' as country identifier")
+    def median(self, start_year, end_year):
+        """Median of every variable over start_year..end_year, as a country x variable frame"""
+        window = [col for col in self._numeric.columns if start_year <= int(col) <= end_year]
+        return self._numeric[window].median(axis=1).unstack('WEO Subject Code')
+
+# Try to initialize WEO data - with error handling for column issues
+print("\nAttempting to load WEO data...")
+w = None
+if weo_cache_file is not None:
+    try:
+        w = CustomWEO(pd.read_parquet(weo_cache_file))
+        print("✓ WEO data loaded from cache")
+    except Exception as e:
+        # e.g. a cache truncated by an interrupted run; reparse weo.csv, which rewrites it
+        print(f"⚠ Could not read WEO cache {weo_cache_file}: {e}")
+
+if w is None:
+    try:
+        weo_data = weo.WEO(weo_filepath)
+        print("✓ WEO data loaded successfully using weo library")
         
-        def getc(self, variable_code):
-            """Get variable data by country"""
-            # Filter for the variable
-            var_data = self.df[self.df['WEO Subject Code'] == variable_code].copy()
-            
-            if var_data.empty:
-                raise ValueError(f"Variable {variable_code} not found")
-            
-            # Get year columns (they're typically numeric column names)
-            year_cols = [col for col in var_data.columns if str(col).isdigit()]
-            
-            # Set country as index
-            var_data = var_data.set_index(self.country_col)
-            
-            # Return only year columns, convert to numeric
-            result = var_data[year_cols].apply(pd.to_numeric, errors='coerce')
-            result.columns = result.columns.astype(int)
-            
-            return result.T  # Transpose so years are rows
+        # weo keeps values as strings with thousands separators; convert them all once
+        w = CustomWEO(
+            weo_data.df.set_index(['ISO', 'WEO Subject Code'])[weo_data.years]
+            .replace(',', '', regex=True)
+            .apply(pd.to_numeric, errors='coerce')
+        )
+    except KeyError as e:
+        print(f"⚠ WEO library encountered column issue: {e}")
+        print("Inspecting CSV structure...")
+        
+        # Read the CSV directly to inspect
+        df_inspect = pd.read_csv(weo_filepath, nrows=5, sep='\t')
+        print(f"Available columns: {df_inspect.columns.tolist()}")
+        
+        # Try alternative approach - read the full CSV, parsing year columns as
+        # floats during the read. Values use thousands separators ("19,612.1"),
+        # which only the C engine understands, so the pyarrow engine is not used.
+        print("\nAttempting to read WEO CSV directly...")
+        year_cols = [col for col in df_inspect.columns if str(col).isdigit()]
+        df_weo = pd.read_csv(
+            weo_filepath,
+            sep='\t',
+            dtype={**{col: 'float64' for col in year_cols}, 'WEO Subject Code': 'category'},
+            na_values=['n/a', '--', ''],
+            thousands=',',
+        )
+        
+        # Look for country-related columns
+        country_cols = [col for col in df_weo.columns if 'country' in col.lower() or 'iso' in col.lower()]
+        print(f"Found potential country columns: {country_cols}")
+        
+        w = CustomWEO.from_csv_frame(df_weo)
+        print("✓ Created custom WEO wrapper")
     
-    w = CustomWEO(df_weo)
-    print("✓ Created custom WEO wrapper")
+    # Cache the numeric frame so later runs on this release skip parsing
+    if weo_version is not None:
+        cache_path = weo_cache_path(*weo_version)
+        try:
+            # Write to a temp file first so an interrupted run can't leave a truncated cache
+            w._numeric.to_parquet(cache_path + '.tmp')
+            os.replace(cache_path + '.tmp', cache_path)
+        except (ImportError, OSError) as e:
+            print(f"⚠ WEO cache not written: {e}")
+            if os.path.exists(cache_path + '.tmp'):
+                os.remove(cache_path + '.tmp')
 
 # Variable definitions
 var_dict = {
@@ -170,46 +361,55 @@ def extract_year_from_index(idx):
         return str(idx)
 
 # Helper function to find specific year in series
-def get_year_data(series_data, target_year):
+def get_year_data(series_data, target_year, year_to_pos):
     """Get data for a specific year, or closest available year"""
-    # Convert index to years
-    index_years = [extract_year_from_index(idx) for idx in series_data.index]
-    
     # Try to find exact year
-    if target_year in index_years:
-        year_pos = index_years.index(target_year)
-        return series_data.iloc[year_pos].sort_values(), target_year
+    if target_year in year_to_pos:
+        return series_data.iloc[year_to_pos[target_year]], target_year
     
     # Find closest year
-    numeric_years = [y for y in index_years if isinstance(y, int)]
+    numeric_years = [y for y in year_to_pos if isinstance(y, int)]
     if numeric_years:
         closest_year = min(numeric_years, key=lambda x: abs(x - target_year))
-        year_pos = index_years.index(closest_year)
-        return series_data.iloc[year_pos].sort_values(), closest_year
+        return series_data.iloc[year_to_pos[closest_year]], closest_year
     
     # Fallback to last available year
-    return series_data.iloc[-1].sort_values(), "last_available"
+    return series_data.iloc[-1], "last_available"
 
 # Collect data for all three datasets
 print("\nCollecting data for variables...")
+# 10-year medians for every variable in one reduction over the numeric frame.
+# On failure use an empty frame so only the median column falls back to NaN below.
+try:
+    medians_10yr = w.median(current_year - 9, current_year)
+except Exception as e:
+    print(f"✗ Error computing 10-year medians: {e}")
+    medians_10yr = pd.DataFrame()
+# Year -> row position map, built once since all variables share the same time index
+year_to_pos = None
 for var in var_dict.keys():
     try:
         # Get full time series for all countries
         series_data = w.getc(var)[embi_countries]
+        if year_to_pos is None:
+            year_to_pos = {extract_year_from_index(idx): pos for pos, idx in enumerate(series_data.index)}
         
-        # Current year (2025) or closest available year
-        current_values, used_year = get_year_data(series_data, current_year)
+        # Current year or closest available year
+        current_values, used_year = get_year_data(series_data, current_year, year_to_pos)
         current_year_data[var] = current_values
         if used_year != current_year:
             print(f"Current year {current_year} not found for {var}, using {used_year} instead")
         
         # 10-year median (last 10 years)
-        median_10yr = series_data.loc[pd.Period(current_year-9, freq='A'):pd.Period(current_year, freq='A')].median().sort_values()
-        median_10yr_data[var] = median_10yr
+        if var in medians_10yr:
+            median_10yr_data[var] = medians_10yr[var].reindex(embi_countries)
+        else:
+            # Keep this variable's other columns; only the median is unavailable
+            median_10yr_data[var] = pd.Series([float('nan')] * len(embi_countries), index=embi_countries)
         
         # 2019 values
         try:
-            values_2019, used_year_2019 = get_year_data(series_data, 2019)
+            values_2019, used_year_2019 = get_year_data(series_data, 2019, year_to_pos)
             data_2019[var] = values_2019
             if used_year_2019 != 2019:
                 print(f"2019 not found for {var}, using {used_year_2019} instead")
@@ -217,9 +417,10 @@ for var in var_dict.keys():
         except Exception as e:
             print(f"Error getting 2019 data for {var}: {e}")
             # Create a series with NaN values for all countries to maintain structure
-            data_2019[var] = pd.Series([float('nan')] * len(embi_countries), index=embi_countries).sort_values()
+            data_2019[var] = pd.Series([float('nan')] * len(embi_countries), index=embi_countries)
         
-        print(f"✓ Successfully collected data for {var}")
+        if VERBOSE:
+            print(f"✓ Successfully collected data for {var}")
         
     except Exception as e:
         print(f"✗ Error collecting data for {var}: {e}")
@@ -233,9 +434,10 @@ clean_current_data = {k: v for k, v in current_year_data.items() if v is not Non
 clean_median_data = {k: v for k, v in median_10yr_data.items() if v is not None}
 clean_2019_data = {k: v for k, v in data_2019.items() if v is not None}
 
-df_current_year = pd.DataFrame(clean_current_data).rename(columns=var_dict)
-df_10yr_median = pd.DataFrame(clean_median_data).rename(columns=var_dict)
-df_2019 = pd.DataFrame(clean_2019_data).rename(columns=var_dict)
+# Rows are aligned by country index, so sort each frame once here
+df_current_year = pd.DataFrame(clean_current_data).rename(columns=var_dict).sort_index()
+df_10yr_median = pd.DataFrame(clean_median_data).rename(columns=var_dict).sort_index()
+df_2019 = pd.DataFrame(clean_2019_data).rename(columns=var_dict).sort_index()
 
 # Display summary information
 print("\n=== SUMMARY ===")
@@ -243,41 +445,29 @@ print(f"Current Year ({current_year}) DataFrame shape: {df_current_year.shape}")
 print(f"10-Year Median DataFrame shape: {df_10yr_median.shape}")
 print(f"2019 DataFrame shape: {df_2019.shape}")
 
-# Create standard pandas DataFrame with MultiIndex columns
-# Add suffixes to distinguish between time periods
-df_current_renamed = df_current_year.add_suffix(f'_{current_year}')
-df_median_renamed = df_10yr_median.add_suffix('_10yr_Median')
-df_2019_renamed = df_2019.add_suffix('_2019')
+# Create standard pandas DataFrame with MultiIndex columns: (Indicator, Time_Period)
+column_names = ['Indicator', 'Time_Period']
+df_current_year.columns = pd.MultiIndex.from_product([df_current_year.columns, [str(current_year)]], names=column_names)
+df_10yr_median.columns = pd.MultiIndex.from_product([df_10yr_median.columns, ['10yr_Median']], names=column_names)
+df_2019.columns = pd.MultiIndex.from_product([df_2019.columns, ['2019']], names=column_names)
 
 # Combine all dataframes horizontally
-dff = pd.concat([df_current_renamed, df_median_renamed, df_2019_renamed], axis=1)
-
-# Create MultiIndex columns: (Indicator, Time_Period)
-# Extract the base indicator names and time periods
-columns_tuples = []
-for col in dff.columns:
-    if col.endswith(f'_{current_year}'):
-        indicator = col.replace(f'_{current_year}', '')
-        columns_tuples.append((indicator, str(current_year)))
-    elif col.endswith('_10yr_Median'):
-        indicator = col.replace('_10yr_Median', '')
-        columns_tuples.append((indicator, '10yr_Median'))
-    elif col.endswith('_2019'):
-        indicator = col.replace('_2019', '')
-        columns_tuples.append((indicator, '2019'))
-
-# Create MultiIndex
-multi_index = pd.MultiIndex.from_tuples(columns_tuples, names=['Indicator', 'Time_Period'])
-dff.columns = multi_index
+dff = pd.concat([df_current_year, df_10yr_median, df_2019], axis=1)
 
 # Sort columns to group indicators together
 dff = dff.sort_index(axis=1)
 
 print(f"\nMerged DataFrame created with shape: {dff.shape}")
 
+# Round the whole frame once, then reshape into a (country, period) x indicator
+# panel so each country is a cheap slice
+round_digits = 1
+# future_stack keeps countries whose values are all NaN, like dff.loc[cc].unstack() did
+panel = dff.round(round_digits).stack(level='Time_Period', future_stack=True)
+
 # Define get_country_df function
-def get_country_df(country_code, round_digits=1, sort_order=None):
-    dfz = dff.loc[country_code].unstack().round(round_digits)[['2025', '2019','10yr_Median',]]
+def get_country_df(country_code, sort_order=None):
+    dfz = panel.xs(country_code, level=0).T.reindex(columns=[str(current_year), '2019', '10yr_Median'])
     
     if sort_order is not None:
         available_indicators = dfz.index.tolist()
@@ -310,7 +500,8 @@ country_dfs = {}
 for country_code in all_countries:
     try:
         country_dfs[country_code] = get_country_df(country_code, sort_order=logical_order)
-        print(f"✓ {country_code}")
+        if VERBOSE:
+            print(f"✓ {country_code}")
     except Exception as e:
         print(f"✗ Error with {country_code}: {e}")
 
@@ -320,14 +511,14 @@ print(f"\nSuccessfully created {len(country_dfs)} country dataframes")
 country_metrics_json = {}
 
 for country_code, df in country_dfs.items():
-    country_metrics_json[country_code] = {}
-    
-    for indicator in df.index:
-        country_metrics_json[country_code][indicator] = {
-            '2025': float(df.loc[indicator, '2025']) if pd.notna(df.loc[indicator, '2025']) else None,
-            '2019': float(df.loc[indicator, '2019']) if pd.notna(df.loc[indicator, '2019']) else None,
-            '10yr_Median': float(df.loc[indicator, '10yr_Median']) if pd.notna(df.loc[indicator, '10yr_Median']) else None
-        }
+    # Read cells from the underlying ndarray instead of going through pandas indexing
+    values = df.to_numpy(dtype='float64')
+    missing = np.isnan(values)
+    periods = df.columns.tolist()
+    country_metrics_json[country_code] = {
+        indicator: {period: None if missing[i, j] else values[i, j].item() for j, period in enumerate(periods)}
+        for i, indicator in enumerate(df.index.tolist())
+    }
 
 print(f"\n✓ Converted {len(country_metrics_json)} countries to JSON format")
 
@@ -350,7 +541,8 @@ html_template = """<!DOCTYPE html>
         const { useState } = React;
         
         // Embedded country data
-        const countryMetrics = COUNTRY_DATA_PLACEHOLDER;
+        const countryMetrics = $COUNTRY_DATA;
+        const currentYear = '$CURRENT_YEAR';
         
         // Country organization by continent
         const countryData = {
@@ -444,8 +636,8 @@ html_template = """<!DOCTYPE html>
             <div className="grid grid-cols-4 gap-4 py-3 border-b border-gray-100 hover:bg-gray-50">
               <div className="col-span-1 font-medium text-gray-700 text-sm">{label}</div>
               <div className="text-right font-semibold text-blue-900">
-                {data['2025']?.toFixed(1) ?? 'N/A'}
-                {getChangeIndicator(data['2025'], data['2019'])}
+                {data[currentYear]?.toFixed(1) ?? 'N/A'}
+                {getChangeIndicator(data[currentYear], data['2019'])}
               </div>
               <div className="text-right text-gray-600">{data['10yr_Median']?.toFixed(1) ?? 'N/A'}</div>
               <div className="text-right text-gray-600">{data['2019']?.toFixed(1) ?? 'N/A'}</div>
@@ -466,7 +658,7 @@ html_template = """<!DOCTYPE html>
 
               <div className="grid grid-cols-4 gap-4 mb-2 pb-2 border-b-2 border-gray-300">
                 <div className="col-span-1 font-bold text-gray-700">Indicator</div>
-                <div className="text-right font-bold text-blue-900">2025</div>
+                <div className="text-right font-bold text-blue-900">{currentYear}</div>
                 <div className="text-right font-bold text-gray-700">10yr Median</div>
                 <div className="text-right font-bold text-gray-700">2019</div>
               </div>
@@ -583,8 +775,17 @@ html_template = """<!DOCTYPE html>
 </body>
 </html>"""
 
-# Replace placeholder with actual data
-html_content = html_template.replace('COUNTRY_DATA_PLACEHOLDER', json.dumps(country_metrics_json, indent=2))
+# Serialize the country data, using orjson's native encoder when available
+if orjson is not None:
+    country_data_json = orjson.dumps(country_metrics_json, option=orjson.OPT_INDENT_2).decode('utf-8')
+else:
+    country_data_json = json.dumps(country_metrics_json, indent=2)
+
+# Fill in the placeholders in one pass; safe_substitute leaves the JS `${...}` template literals alone
+html_content = string.Template(html_template).safe_substitute(
+    COUNTRY_DATA=country_data_json,
+    CURRENT_YEAR=current_year,
+)
 
 # Save HTML file to script directory
 output_filename = os.path.join(SCRIPT_DIR, 'index.html')